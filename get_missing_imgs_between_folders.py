@@ -30,33 +30,298 @@
 ####################################################################################################
 """
 
+import errno
+import hashlib
+import mmap
 import os
+import queue
 import shutil
-from tkinter import Tk, Label, Button, Entry, Checkbutton, IntVar, messagebox, colorchooser
+import sys
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from tkinter import Tk, Label, Button, Entry, Checkbutton, IntVar, messagebox, colorchooser, ttk
 from tkinter.filedialog import askdirectory
 from PIL import Image
 
+# Number of threads used to copy files; copying is IO-bound, so this can exceed the core count
+COPY_WORKERS = 15
+
+# Number of images handed to a corner check process at a time
+CORNER_CHECK_CHUNKSIZE = 32
+
+# Most bytes of not yet checked images to have read-ahead requested for at once, so prefetching doesn't
+# evict images from the page cache before the corner check processes reach them
+PREFETCH_BYTES = 256 * 1024 * 1024
+
+# How often the UI polls the worker thread for progress, in milliseconds
+PROGRESS_POLL_MS = 100
+
+# Prefix and suffix of the uniquely named logs of unreadable images written to the missing directory
+ERRORS_LOG_PREFIX = "corner_check_errors_"
+ERRORS_LOG_SUFFIX = ".log"
+
+# Image modes whose pixels already start with red, green and blue channels
+RGB_MODES = frozenset({"RGB", "RGBA", "RGBX"})
+
+# Where the base name manifests of scanned upscaled directories are cached between runs
+# (a per-user cache directory, so other users can't plant or redirect manifests)
+if sys.platform == "win32":
+    _cache_home = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+elif sys.platform == "darwin":
+    _cache_home = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+else:
+    _cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+MANIFEST_DIR = os.path.join(_cache_home, "get_missing_imgs_between_folders")
+
+# Extensions of the source files that are treated as images
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tif', '.tiff'})
+
+# copy_file_range errors that mean the kernel or filesystem can't do the copy, rather than a real IO failure
+COPY_FILE_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ETXTBSY, errno.EPERM}
+
+# os.link errors that mean the files can't be hard linked (other devices, FAT drives, link limits), so they are copied
+LINK_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.EINVAL}
+
+# clonefile(2) from libSystem, used for copy-on-write copies on APFS
+if sys.platform == "darwin":
+    import ctypes
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _clonefile = _libc.clonefile
+    _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    _clonefile.restype = ctypes.c_int
+else:
+    _clonefile = None
+
 def list_files(directory):
-    """List files in a directory."""
-    return os.listdir(directory)
+    """List the entries of a directory as os.DirEntry objects with cached file types."""
+    with os.scandir(directory) as entries:
+        return list(entries)
 
-def is_corner_color(pixel, target_color=(0, 0, 0), threshold=10):
-    """Check if a corner pixel is close to the target color based on a threshold."""
-    return all(abs(pixel[i] - target_color[i]) <= threshold for i in range(3))
+def split_name_lower(name):
+    """Split a bare file name into its lowercased base name and extension, without os.path.splitext's overhead."""
+    name = name.lower()
+    index = name.rfind('.')
+    # A leading dot marks a hidden file rather than an extension
+    if index > 0:
+        return name[:index], name[index:]
+    return name, ''
+
+def manifest_path(upscaled_dir):
+    """Return the path of the cached base name manifest for an upscaled directory."""
+    key = hashlib.blake2b(os.fsencode(os.path.normcase(os.path.abspath(upscaled_dir))), digest_size=16).hexdigest()
+    return os.path.join(MANIFEST_DIR, f"{key}.manifest")
+
+def hash_base_name(base_name):
+    """Hash a lowercased base name to the stable 64-bit value stored in manifests."""
+    return int.from_bytes(hashlib.blake2b(os.fsencode(base_name), digest_size=8).digest(), 'little')
+
+def write_manifest(path, mtime_ns, hashes):
+    """Write the directory modification time followed by the sorted base name hashes as uint64s."""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    # Write to a fresh temporary file first so a reader never maps a half-written manifest, and so concurrent
+    # runs never share a temporary name
+    fd, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with open(fd, 'wb') as file:
+            array('Q', [mtime_ns]).tofile(file)
+            hashes.tofile(file)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+def read_manifest(path, mtime_ns):
+    """Memory-map a manifest and return its sorted hashes, or None if it is missing or out of date."""
+    try:
+        with open(path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapping) % 8 or len(mapping) == 0:
+        mapping.close()
+        return None
+    hashes = memoryview(mapping).cast('Q')
+    if hashes[0] != mtime_ns:
+        hashes.release()
+        mapping.close()
+        return None
+    return hashes[1:]
+
+def manifest_contains(hashes, base_name):
+    """Check if a lowercased base name is in the sorted hashes of a manifest."""
+    value = hash_base_name(base_name)
+    index = bisect_left(hashes, value)
+    return index < len(hashes) and hashes[index] == value
+
+def copy_with_copy_file_range(source_path, destination_path):
+    """Copy a file's contents entirely inside the kernel using os.copy_file_range."""
+    with open(source_path, 'rb') as source_file:
+        reader = source_file.fileno()
+        # Open without truncating so copying a file onto itself can be detected before any data is lost
+        writer = os.open(destination_path, os.O_WRONLY | os.O_CREAT, 0o666)
+        try:
+            if os.path.sameopenfile(reader, writer):
+                raise shutil.SameFileError(f"{source_path!r} and {destination_path!r} are the same file")
+            os.ftruncate(writer, 0)
+            while os.copy_file_range(reader, writer, 1 << 30):
+                pass
+        finally:
+            os.close(writer)
+
+def fast_copy(source_path, destination_path):
+    """Copy a file's contents, letting the filesystem or kernel do the work when possible."""
+    # On APFS, clone the file (copy-on-write); this fails if the destination already exists
+    if _clonefile is not None and _clonefile(os.fsencode(source_path), os.fsencode(destination_path), 0) == 0:
+        return
+
+    # On Linux, keep the data in the kernel (and let filesystems that support it share extents)
+    if hasattr(os, "copy_file_range"):
+        try:
+            copy_with_copy_file_range(source_path, destination_path)
+            return
+        except OSError as e:
+            if e.errno not in COPY_FILE_RANGE_UNSUPPORTED:
+                raise
+
+    # shutil.copyfile still avoids a userspace buffer where it can, via sendfile on Linux and fcopyfile on macOS
+    shutil.copyfile(source_path, destination_path)
+
+def copy_file(source_path, destination_path):
+    """Copy a file with fast_copy, replacing a destination that link mode left hard linked to the source."""
+    try:
+        fast_copy(source_path, destination_path)
+    except shutil.SameFileError:
+        # Only a link in another directory can be dropped; in the same directory the destination is the source itself
+        source_dir = os.path.dirname(os.path.abspath(source_path))
+        if os.path.samefile(source_dir, os.path.dirname(os.path.abspath(destination_path))):
+            raise
+        os.unlink(destination_path)
+        fast_copy(source_path, destination_path)
+
+def link_file(source_path, destination_path):
+    """Hard link the destination to the source, replacing an existing destination that is a different file."""
+    try:
+        os.link(source_path, destination_path)
+        return
+    except FileExistsError:
+        # A previous run may already have linked this file
+        if os.path.samefile(source_path, destination_path):
+            return
+
+    # Link under a temporary name and swap it in, so the existing file is replaced rather than written through
+    temporary_path = f"{destination_path}.link-tmp"
+    try:
+        os.unlink(temporary_path)
+    except FileNotFoundError:
+        pass
+    os.link(source_path, temporary_path)
+    try:
+        os.replace(temporary_path, destination_path)
+    except OSError:
+        os.unlink(temporary_path)
+        raise
+
+def link_or_copy(source_path, destination_path):
+    """Hard link the destination to the source, copying instead when the filesystem can't link (e.g. across devices)."""
+    try:
+        link_file(source_path, destination_path)
+    except OSError as e:
+        if e.errno not in LINK_UNSUPPORTED:
+            raise
+        copy_file(source_path, destination_path)
+
+def prefetch_file(path):
+    """Ask the kernel to start reading a file into the page cache in the background, returning its size."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return 0
+    try:
+        size = os.fstat(fd).st_size
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        return size
+    except OSError:
+        return 0
+    finally:
+        os.close(fd)
+
+def prefetch_files(paths, prefetched_sizes, in_flight_bytes):
+    """Prefetch the paths after the ones already in prefetched_sizes until PREFETCH_BYTES are in flight.
+
+    Appends the size of each newly prefetched file to prefetched_sizes and returns the updated in-flight bytes.
+    """
+    while len(prefetched_sizes) < len(paths) and in_flight_bytes < PREFETCH_BYTES:
+        size = prefetch_file(paths[len(prefetched_sizes)])
+        prefetched_sizes.append(size)
+        in_flight_bytes += size
+    return in_flight_bytes
+
+def write_errors_log(missing_dir, errors):
+    """Write the unreadable images to a new, uniquely named log in the missing directory and return its path."""
+    # mkstemp never reuses an existing name, so files already in the missing directory are left alone
+    fd, path = tempfile.mkstemp(prefix=ERRORS_LOG_PREFIX, suffix=ERRORS_LOG_SUFFIX, dir=missing_dir, text=True)
+    with open(fd, 'w', encoding='utf-8') as log:
+        log.writelines(f"Error processing image {image_path}: {error}\n" for image_path, error in errors)
+    return path
+
+def corner_color_bounds(target_color, threshold=10):
+    """Return the inclusive (low, high) range each channel of a corner pixel must fall in to match the target color."""
+    return tuple((channel - threshold, channel + threshold) for channel in target_color)
 
 def check_corners_color(image_path, target_color, threshold=10):
-    """Check if all four corners of the image are close to the target color."""
+    """Check if all four corners of the image are close to the target color.
+
+    Returns a (passed, error) tuple, where error describes why the image couldn't be read, or is None.
+    """
+    return check_corners_within_bounds(image_path, corner_color_bounds(target_color, threshold))
+
+def check_corners_within_bounds(image_path, bounds):
+    """Check if all four corners of the image fall within the per-channel bounds from corner_color_bounds.
+
+    Returns a (passed, error) tuple like check_corners_color.
+    """
+    # The bounds specialize the corner test to the target color, so each corner is just three range comparisons
+    (low_r, high_r), (low_g, high_g), (low_b, high_b) = bounds
     try:
         with Image.open(image_path) as img:
             pixels = img.load()
             width, height = img.size
-            corners = [pixels[0, 0], pixels[0, height - 1], pixels[width - 1, 0], pixels[width - 1, height - 1]]
-            return all(is_corner_color(corner, target_color, threshold) for corner in corners)
+            # Grayscale, palette and CMYK pixels aren't RGB triples, so convert just the corner pixels of those
+            is_rgb = img.mode in RGB_MODES
+            # Test the opposite top-left and bottom-right corners first and stop at the first mismatch
+            for x, y in ((0, 0), (width - 1, height - 1), (0, height - 1), (width - 1, 0)):
+                pixel = pixels[x, y] if is_rgb else img.crop((x, y, x + 1, y + 1)).convert("RGB").getpixel((0, 0))
+                if not (low_r <= pixel[0] <= high_r and low_g <= pixel[1] <= high_g and low_b <= pixel[2] <= high_b):
+                    return False, None
+            return True, None
     except Exception as e:
-        print(f"Error processing image {image_path}: {e}")
-        return False
+        return False, str(e)
+
+# Process pool for the corner checks, kept warm between runs so each click doesn't start new processes
+corner_check_pool = None
+
+def get_corner_check_pool():
+    """Return the shared corner check process pool, creating it on first use."""
+    global corner_check_pool
+    if corner_check_pool is None:
+        # The default worker count follows the CPU count but respects the 61-process limit on Windows
+        corner_check_pool = ProcessPoolExecutor()
+    return corner_check_pool
+
+def shutdown_corner_check_pool():
+    """Shut down the shared corner check process pool, if one was started, without waiting on it."""
+    global corner_check_pool
+    if corner_check_pool is not None:
+        corner_check_pool.shutdown(wait=False, cancel_futures=True)
+        corner_check_pool = None
 
 def find_and_copy_missing_images():
+    """Validate the chosen directories and start finding and copying the missing images in the background."""
     source_dir = source_dir_entry.get()
     upscaled_dir = upscaled_dir_entry.get()
     missing_dir = missing_dir_entry.get()
@@ -75,37 +340,177 @@ def find_and_copy_missing_images():
     target_color = color_entry.get()
     target_color_rgb = tuple(int(target_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
 
-    # Collect base names of files in the upscaled directory
-    upscaled_files_base_names = set(os.path.splitext(f)[0].lower() for f in os.listdir(upscaled_dir))
+    link_files = link_var.get()
 
-    copied_files_count = 0
+    # Run the scan and copy on a worker thread so the window keeps repainting, and poll it for progress
+    run_button.config(state="disabled")
+    progress_bar.config(value=0)
+    threading.Thread(target=copy_missing_images_worker, daemon=True,
+                     args=(source_dir, upscaled_dir, missing_dir, check_black_corners, target_color_rgb, link_files,
+                           progress_queue)).start()
+    root.after(PROGRESS_POLL_MS, poll_progress)
+
+def copy_missing_images_worker(source_dir, upscaled_dir, missing_dir, check_black_corners, target_color_rgb,
+                               link_files, progress):
+    """Run copy_missing_images on a worker thread, posting its outcome to the progress queue."""
+    try:
+        copied_files_count, error_count, errors_log_path = copy_missing_images(
+            source_dir, upscaled_dir, missing_dir, check_black_corners, target_color_rgb, link_files, progress)
+    except Exception as e:
+        progress.put(("error", str(e)))
+    else:
+        progress.put(("done", copied_files_count, error_count, errors_log_path, link_files))
+
+def poll_progress():
+    """Apply the progress posted by the worker thread, showing the result once it has finished."""
+    # Drain everything posted since the last tick but only apply the latest progress, so a flood of
+    # per-file messages costs one widget update per tick instead of keeping the Tk thread busy
+    latest_progress = None
+    message = None
+    try:
+        while True:
+            message = progress_queue.get_nowait()
+            if message[0] != "progress":
+                break
+            latest_progress = message
+            message = None
+    except queue.Empty:
+        pass
+
+    if latest_progress is not None:
+        _, done, total = latest_progress
+        progress_bar.config(maximum=max(total, 1), value=done)
+
+    if message is not None:
+        # The worker has finished, so stop polling and provide feedback to the user
+        run_button.config(state="normal")
+        if message[0] == "error":
+            messagebox.showerror("Error", f"Failed to copy the missing images: {message[1]}")
+            return
+
+        _, copied_files_count, error_count, errors_log_path, link_files = message
+        if copied_files_count == 0:
+            feedback = "No files were flagged as missing."
+        elif link_files:
+            # Linked files share their data with the source files, so say so rather than calling them copies
+            feedback = (f"Flagged {copied_files_count} files as missing and hard linked or copied them to the "
+                        f"missing directory.")
+        else:
+            feedback = f"Flagged {copied_files_count} files as missing and copied to the missing directory."
+        if errors_log_path is not None:
+            feedback += (f"\n\n{error_count} images could not be read; "
+                         f"see {os.path.basename(errors_log_path)} in the missing directory.")
+        elif error_count:
+            feedback += f"\n\n{error_count} images could not be read, and the errors log couldn't be written."
+        messagebox.showinfo("Info", feedback)
+        return
+
+    root.after(PROGRESS_POLL_MS, poll_progress)
+
+def copy_missing_images(source_dir, upscaled_dir, missing_dir, check_black_corners, target_color_rgb, link_files,
+                        progress):
+    """Copy the source images that have no base-named equivalent in the upscaled directory.
+
+    With link_files set, the images are hard linked into the missing directory where possible instead of copied.
+    Returns the number of copied files, the number of images that couldn't be read for the corner check and the
+    path of the new log in the missing directory listing them (None if there were none or it couldn't be written).
+    The progress of the corner check and copy
+    phases is posted to the progress queue as ("progress", done, total) messages.
+    """
+    # Reuse the manifest cached by an earlier run if the upscaled directory hasn't changed since
+    upscaled_mtime_ns = os.stat(upscaled_dir).st_mtime_ns
+    upscaled_manifest_path = manifest_path(upscaled_dir)
+    upscaled_hashes = read_manifest(upscaled_manifest_path, upscaled_mtime_ns)
+    if upscaled_hashes is None:
+        # Collect the hashed base names of files in the upscaled directory, ignoring hidden files such as
+        # .DS_Store; a sorted uint64 array takes 8 bytes per file, far less than a set of the names themselves
+        with os.scandir(upscaled_dir) as entries:
+            upscaled_hashes = array('Q', sorted(hash_base_name(split_name_lower(entry.name)[0]) for entry in entries
+                                                if not entry.name.startswith('.') and entry.is_file()))
+
+        # The manifest is only a cache, so failing to write it shouldn't stop the run
+        try:
+            write_manifest(upscaled_manifest_path, upscaled_mtime_ns, upscaled_hashes)
+        except OSError as e:
+            print(f"Error writing manifest {upscaled_manifest_path}: {e}")
+    is_upscaled = partial(manifest_contains, upscaled_hashes)
 
-    # Iterate through source files and check against upscaled files
-    for filename in os.listdir(source_dir):
-        base_name, extension = os.path.splitext(filename)
-        base_name_lower = base_name.lower()
+    # Collect source files that have no base-named equivalent in the upscaled directory
+    missing_files = []
+    # Bind the functions used per entry to locals to skip the global and attribute lookups in the loop
+    split_name = split_name_lower
+    add_missing_file = missing_files.append
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            base_name_lower, extension = split_name(entry.name)
 
-        # Skip file if a base-named equivalent exists in the upscaled directory
-        if base_name_lower in upscaled_files_base_names:
-            continue
+            # Skip non-image files such as Thumbs.db, .DS_Store or sidecar files before anything touches them
+            if extension not in IMAGE_EXTENSIONS:
+                continue
 
-        # Perform corner color check if required
-        source_path = os.path.join(source_dir, filename)
-        if check_black_corners:
-            # Skip copying if the image doesn't pass the corner color check
-            if not check_corners_color(source_path, target_color_rgb):
+            # Skip subdirectories and other non-file entries
+            if not entry.is_file():
                 continue
 
-        # Copy the file to the missing directory with its original name
-        missing_path = os.path.join(missing_dir, filename)
-        shutil.copy(source_path, missing_path)
-        copied_files_count += 1
+            # Skip file if a base-named equivalent exists in the upscaled directory
+            if is_upscaled(base_name_lower):
+                continue
 
-    # Provide feedback to the user
-    if copied_files_count == 0:
-        messagebox.showinfo("Info", "No files were flagged as missing.")
-    else:
-        messagebox.showinfo("Info", f"Flagged {copied_files_count} files as missing and copied to the missing directory.")
+            add_missing_file(entry)
+
+    # Perform corner color check if required, spreading the image decoding across processes
+    errors = []
+    if check_black_corners:
+        source_paths = [entry.path for entry in missing_files]
+        # Work out the target color bounds once here rather than once per image in the processes
+        check_corners = partial(check_corners_within_bounds, bounds=corner_color_bounds(target_color_rgb))
+        try:
+            results = get_corner_check_pool().map(check_corners, source_paths, chunksize=CORNER_CHECK_CHUNKSIZE)
+
+            # Where supported, keep read-ahead requested for the next PREFETCH_BYTES of images to check, so the
+            # disk works on several files at once; this starts after map() so the processes aren't kept waiting
+            prefetch = hasattr(os, "posix_fadvise")
+            prefetched_sizes = []
+            in_flight_bytes = prefetch_files(source_paths, prefetched_sizes, 0) if prefetch else 0
+
+            # Skip copying the images that don't pass the corner color check, collecting the unreadable ones
+            passed_files = []
+            for checked_count, (entry, (passed, error)) in enumerate(zip(missing_files, results), 1):
+                if prefetch:
+                    if checked_count <= len(prefetched_sizes):
+                        in_flight_bytes -= prefetched_sizes[checked_count - 1]
+                    in_flight_bytes = prefetch_files(source_paths, prefetched_sizes, in_flight_bytes)
+                if passed:
+                    passed_files.append(entry)
+                elif error is not None:
+                    errors.append((entry.path, error))
+                progress.put(("progress", checked_count, len(source_paths)))
+        except BrokenProcessPool:
+            # A process died, so let the next run start a fresh pool
+            shutdown_corner_check_pool()
+            raise
+        missing_files = passed_files
+
+    # Copy (or link) the files to the missing directory with their original names, overlapping the copies on threads
+    source_paths = [entry.path for entry in missing_files]
+    missing_paths = [os.path.join(missing_dir, entry.name) for entry in missing_files]
+    copy_missing_file = link_or_copy if link_files else copy_file
+    copied_files_count = 0
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        for _ in executor.map(copy_missing_file, source_paths, missing_paths):
+            copied_files_count += 1
+            progress.put(("progress", copied_files_count, len(source_paths)))
+
+    # Log the unreadable images from the corner check once, instead of printing from every worker process;
+    # the log is only a diagnostic, so failing to write it is just reported
+    errors_log_path = None
+    if errors:
+        try:
+            errors_log_path = write_errors_log(missing_dir, errors)
+        except OSError as e:
+            print(f"Error writing errors log in {missing_dir}: {e}")
+
+    return copied_files_count, len(errors), errors_log_path
 
 def select_directory(entry):
     """Open a dialog to select a directory, updating the entry with the chosen path."""
@@ -122,45 +527,58 @@ def choose_color():
         color_entry.insert(0, color_code)
 
 def on_escape(event=None):
-    """Close the application when the Escape key is pressed."""
+    """Close the application when the Escape key is pressed or the window is closed."""
+    shutdown_corner_check_pool()
     root.destroy()
 
-# Set up the UI
-root = Tk()
-root.title("Image Processing Tool")
-
-# Bind the Escape key to the on_escape function
-root.bind('<Escape>', on_escape)
-
-# Source directory
-Label(root, text="Source Directory:").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-source_dir_entry = Entry(root, width=50)
-source_dir_entry.grid(row=0, column=1, padx=5, pady=5)
-Button(root, text="...", command=lambda: select_directory(source_dir_entry)).grid(row=0, column=2, padx=5, pady=5)
-
-# Upscaled directory
-Label(root, text="Upscaled Directory:").grid(row=1, column=0, sticky='e', padx=5, pady=5)
-upscaled_dir_entry = Entry(root, width=50)
-upscaled_dir_entry.grid(row=1, column=1, padx=5, pady=5)
-Button(root, text="...", command=lambda: select_directory(upscaled_dir_entry)).grid(row=1, column=2, padx=5, pady=5)
-
-# Missing directory
-Label(root, text="Missing Directory:").grid(row=2, column=0, sticky='e', padx=5, pady=5)
-missing_dir_entry = Entry(root, width=50)
-missing_dir_entry.grid(row=2, column=1, padx=5, pady=5)
-Button(root, text="...", command=lambda: select_directory(missing_dir_entry)).grid(row=2, column=2, padx=5, pady=5)
-
-# Checkbox for corner color check
-check_var = IntVar()
-Checkbutton(root, text="Enable corner color check", variable=check_var).grid(row=3, column=0, columnspan=2, sticky='w', padx=5, pady=5)
-
-# Color picker for corner color
-color_entry = Entry(root, width=10)
-color_entry.grid(row=3, column=1, padx=5, pady=5)
-color_entry.insert(0, '#000000')  # Default color black
-Button(root, text="Choose Corner Color", command=choose_color).grid(row=3, column=2, padx=5, pady=5)
-
-# Button to start the process
-Button(root, text="Find and Copy Missing Images", command=find_and_copy_missing_images).grid(row=4, column=0, columnspan=3, padx=5, pady=5)
-
-root.mainloop()
+if __name__ == "__main__":
+    # Set up the UI
+    root = Tk()
+    root.title("Image Processing Tool")
+
+    # Bind the Escape key to the on_escape function
+    root.bind('<Escape>', on_escape)
+    root.protocol("WM_DELETE_WINDOW", on_escape)
+
+    # Source directory
+    Label(root, text="Source Directory:").grid(row=0, column=0, sticky='e', padx=5, pady=5)
+    source_dir_entry = Entry(root, width=50)
+    source_dir_entry.grid(row=0, column=1, padx=5, pady=5)
+    Button(root, text="...", command=lambda: select_directory(source_dir_entry)).grid(row=0, column=2, padx=5, pady=5)
+
+    # Upscaled directory
+    Label(root, text="Upscaled Directory:").grid(row=1, column=0, sticky='e', padx=5, pady=5)
+    upscaled_dir_entry = Entry(root, width=50)
+    upscaled_dir_entry.grid(row=1, column=1, padx=5, pady=5)
+    Button(root, text="...", command=lambda: select_directory(upscaled_dir_entry)).grid(row=1, column=2, padx=5, pady=5)
+
+    # Missing directory
+    Label(root, text="Missing Directory:").grid(row=2, column=0, sticky='e', padx=5, pady=5)
+    missing_dir_entry = Entry(root, width=50)
+    missing_dir_entry.grid(row=2, column=1, padx=5, pady=5)
+    Button(root, text="...", command=lambda: select_directory(missing_dir_entry)).grid(row=2, column=2, padx=5, pady=5)
+
+    # Checkbox for corner color check
+    check_var = IntVar()
+    Checkbutton(root, text="Enable corner color check", variable=check_var).grid(row=3, column=0, columnspan=2, sticky='w', padx=5, pady=5)
+
+    # Color picker for corner color
+    color_entry = Entry(root, width=10)
+    color_entry.grid(row=3, column=1, padx=5, pady=5)
+    color_entry.insert(0, '#000000')  # Default color black
+    Button(root, text="Choose Corner Color", command=choose_color).grid(row=3, column=2, padx=5, pady=5)
+
+    # Checkbox for hard linking instead of copying
+    link_var = IntVar()
+    Checkbutton(root, text="Hard link instead of copying (same drive only)", variable=link_var).grid(row=4, column=0, columnspan=3, sticky='w', padx=5, pady=5)
+
+    # Button to start the process
+    run_button = Button(root, text="Find and Copy Missing Images", command=find_and_copy_missing_images)
+    run_button.grid(row=5, column=0, columnspan=3, padx=5, pady=5)
+
+    # Progress of the running scan and copy, fed by the worker thread through a queue
+    progress_queue = queue.Queue()
+    progress_bar = ttk.Progressbar(root, mode="determinate")
+    progress_bar.grid(row=6, column=0, columnspan=3, sticky='we', padx=5, pady=5)
+
+    root.mainloop()
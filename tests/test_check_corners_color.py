@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from get_missing_imgs_between_folders import check_corners_color
+
+
+class CheckCornersColorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def save_bordered_image(self, filename, border, border_color=(0, 0, 0), fill_color=(200, 200, 200)):
+        """Save an 800x600 image with a border of the given width and return its path."""
+        img = Image.new("RGB", (800, 600), border_color)
+        ImageDraw.Draw(img).rectangle((border, border, 799 - border, 599 - border), fill=fill_color)
+        path = os.path.join(self.directory.name, filename)
+        img.save(path, quality=95)
+        return path
+
+    def test_thin_black_border_jpeg_passes(self):
+        path = self.save_bordered_image("thin_border.jpg", border=2)
+        self.assertEqual(check_corners_color(path, (0, 0, 0)), (True, None))
+
+    def test_thin_black_border_png_passes(self):
+        path = self.save_bordered_image("thin_border.png", border=2)
+        self.assertEqual(check_corners_color(path, (0, 0, 0)), (True, None))
+
+    def test_corners_of_another_color_fail(self):
+        path = self.save_bordered_image("white_border.png", border=2, border_color=(255, 255, 255))
+        self.assertEqual(check_corners_color(path, (0, 0, 0)), (False, None))
+
+    def test_grayscale_image_passes(self):
+        path = os.path.join(self.directory.name, "gray.png")
+        Image.new("L", (20, 20), 5).save(path)
+        self.assertEqual(check_corners_color(path, (0, 0, 0)), (True, None))
+
+    def test_unreadable_file_reports_error(self):
+        path = os.path.join(self.directory.name, "broken.png")
+        with open(path, "wb") as file:
+            file.write(b"not an image")
+        passed, error = check_corners_color(path, (0, 0, 0))
+        self.assertFalse(passed)
+        self.assertIsNotNone(error)
+
+
+if __name__ == "__main__":
+    unittest.main()